@@ -0,0 +1,100 @@
+"""Benchmark of response parsing in parse executor - Бенчмарк разбора ответов
+
+Decodes and validates synthetic OperationsResponse payloads the same way ApiClient does
+and prints, for inline parsing and for thread and process pools of 1..N workers:
+throughput, CPU time of the event loop thread per payload and CPU time of the whole
+parent process per payload (includes pool threads, excludes pool processes).
+
+    python benchmarks/parse_executor.py --payloads 64 --days 60 --operations 50
+
+The package is imported from this checkout, no install or PYTHONPATH is needed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wb_franchise_api_client import create_parse_executor, parse_operations, parse_raw_response
+
+
+def make_payload(days: int, operations: int) -> bytes:
+    details = []
+    for day in range(days):
+        dt = f"2024-{day // 28 % 12 + 1:02d}-{day % 28 + 1:02d}T00:00:00"
+        details.append({
+            "date": dt,
+            "operations": [
+                {
+                    "dt": dt,
+                    "oper_type": i % 6 + 1,
+                    "oper_amount": i * 1.5,
+                    "comment": f"comment {i % 7}",
+                    "grouped": [
+                        {"dt": dt, "oper_type": i % 6 + 1, "oper_amount": 0.75, "comment": None},
+                        {"dt": dt, "oper_type": i % 6 + 1, "oper_amount": 0.75, "comment": None},
+                    ],
+                }
+                for i in range(operations)
+            ],
+        })
+    data = {"balance": 0, "currency_code": "RUB", "plan_payment_date": "2024-12-31", "details": details}
+    return json.dumps(data).encode()
+
+
+async def run(executor: Optional[Executor], body: bytes, payloads: int) -> tuple[float, float, float]:
+    """Parse payloads, return (payloads/s, loop thread CPU ms/payload, parent process CPU ms/payload)"""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    start_thread = time.thread_time()
+    start_process = time.process_time()
+    if executor is None:
+        for _ in range(payloads):
+            parse_raw_response(parse_operations, body, 200, "operations")
+    else:
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, parse_raw_response, parse_operations, body, 200, "operations")
+            for _ in range(payloads)
+        ))
+    return (payloads / (time.perf_counter() - start),
+            (time.thread_time() - start_thread) * 1000 / payloads,
+            (time.process_time() - start_process) * 1000 / payloads)
+
+
+def report(name: str, result: tuple[float, float, float], baseline: float) -> None:
+    throughput, loop_cpu, process_cpu = result
+    print(f"{name:<14} {throughput:8.1f} payloads/s  x{throughput / baseline:.2f}  "
+          f"loop CPU {loop_cpu:6.2f} ms  parent CPU {process_cpu:6.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payloads", type=int, default=64)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--operations", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    body = make_payload(args.days, args.operations)
+    print(f"payload size: {len(body) / 1024:.0f} KiB, payloads: {args.payloads}")
+    inline = await run(None, body, args.payloads)
+    report("inline", inline, inline[0])
+
+    for processes in (False, True):
+        workers = 1
+        while workers <= args.max_workers:
+            with create_parse_executor(max_workers=workers, processes=processes) as executor:
+                # прогрев пула, чтобы не учитывать запуск процессов
+                await run(executor, body, workers)
+                result = await run(executor, body, args.payloads)
+            report(f"{'processes' if processes else 'threads'}={workers}", result, inline[0])
+            workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import copy
+
+from wb_franchise_api_client import (ShortageResponse, OfficeProceed, OfficeRate, OfficeSpeed, merge_by_office,
+                                     group_by_office, index_by_office)
+
+
+def make_shortages() -> ShortageResponse:
+    def shortage(shortage_id, status_id, employee_id=None):
+        return {"shortage_id": shortage_id, "create_dt": "2024-01-02T10:00:00", "guilty_employee_id": employee_id,
+                "amount": 10, "comment": "", "status_id": status_id, "is_history_exist": False}
+
+    return ShortageResponse(total_amount=30, offices=[
+        {"office_id": 1, "office_name": "A", "office_amount": 20,
+         "shortages": [shortage(11, 1, 100), shortage(12, 2)]},
+        {"office_amount": 10, "shortages": [shortage(13, 1, 100)]},
+    ])
+
+
+def test_shortage_indexes():
+    response = make_shortages()
+    assert list(response.offices_by_id) == [1]
+    assert list(response.shortages_by_id) == [11, 12, 13]
+    assert response.office_id_by_shortage_id == {11: 1, 12: 1, 13: None}
+    assert [s.shortage_id for s in response.shortages_by_employee_id[100]] == [11, 13]
+    assert [s.shortage_id for s in response.shortages_by_status_id[1]] == [11, 13]
+    assert list(response.shortages_by_date) == ["2024-01-02"]
+    assert list(response.offices[0].shortages_by_id) == [11, 12]
+
+
+def test_indexes_are_dropped_on_assignment_and_copy():
+    response = make_shortages()
+    assert response.shortages_by_id
+    assert response.model_copy(update={"offices": []}).shortages_by_id == {}
+    assert copy.deepcopy(response).shortages_by_id.keys() == response.shortages_by_id.keys()
+    response.offices = response.offices[:1]
+    assert list(response.shortages_by_id) == [11, 12]
+
+
+def test_merge_by_office():
+    rates = [OfficeRate(avg_rate=4.5, avg_region_rate=4.7, office_id=1)]
+    speeds = [OfficeSpeed(avg_hours=2, avg_hours_by_region=3, office_id=2)]
+    merged = merge_by_office(rate=rates, speed=speeds, grouped=group_by_office(rates + rates))
+    assert merged[1]["rate"] is rates[0]
+    assert merged[1]["speed"] is None
+    assert merged[1]["grouped"] == [rates[0], rates[0]]
+    assert merged[2] == {"rate": None, "speed": speeds[0], "grouped": None}
+
+
+def test_index_names_are_collected_per_class():
+    assert ShortageResponse.__index_names__ == {"offices_by_id", "shortages_by_id", "office_id_by_shortage_id",
+                                                "shortages_by_employee_id", "shortages_by_status_id",
+                                                "shortages_by_date"}
+
+
+def test_offices_without_id_are_skipped():
+    response = make_shortages()
+    assert list(index_by_office(response.offices)) == [1]
+    assert list(group_by_office(response.offices)) == [1]
+    assert list(merge_by_office(shortages=response.offices)) == [1]
+
+
+def test_proceeds_by_date_keeps_all_rows():
+    row = {"date": "2024-01-01", "sale_sum": 1, "sale_count": 1, "return_sum": 0, "return_count": 0,
+           "proceeds": 1, "diff_count": 0, "on_place_count": 0, "source_type": 1}
+    proceed = OfficeProceed(office_id=1, office_name="A", office_shk="shk",
+                            by_office=[row, {**row, "source_type": 2}])
+    assert [item.source_type for item in proceed.by_date["2024-01-01"]] == [1, 2]
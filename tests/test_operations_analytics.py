@@ -0,0 +1,72 @@
+import pytest
+
+from wb_franchise_api_client import OperationsAnalytics, OperationsResponse, transform_operations
+
+
+def make_response(balance: float, days: dict[str, list[tuple[int, float, str | None]]]) -> OperationsResponse:
+    details = [
+        {"date": f"{day}T00:00:00",
+         "operations": [{"dt": day, "oper_type": oper_type, "oper_amount": amount, "comment": comment}
+                        for oper_type, amount, comment in operations]}
+        for day, operations in days.items()
+    ]
+    data = {"balance": balance, "currency_code": "RUB", "plan_payment_date": "2024-02-01", "details": details}
+    return OperationsResponse(**transform_operations(data))
+
+
+def test_grouped_operations_are_not_counted_twice():
+    data = {"balance": 100, "currency_code": "RUB", "plan_payment_date": "2024-02-01", "details": [
+        {"date": "2024-01-01", "operations": [
+            {"dt": "2024-01-01", "oper_type": 6, "oper_amount": 100, "grouped": [
+                {"dt": "2024-01-01", "oper_type": 6, "oper_amount": 60, "comment": "a"},
+                {"dt": "2024-01-01", "oper_type": 6, "oper_amount": 40, "comment": "b"},
+            ]},
+        ]},
+    ]}
+    analytics = OperationsAnalytics(OperationsResponse(**transform_operations(data)))
+    assert analytics.totals_by_type() == {6: 100.0}
+    assert analytics.top_comments() == [("a", 1, 60.0), ("b", 1, 40.0)]
+
+
+def test_rollups():
+    analytics = OperationsAnalytics(make_response(50, {
+        "2024-01-30": [(6, 100, "sales"), (1, -30, "shortage")],
+        "2024-02-05": [(2, 10, None), (6, 20, "sales")],
+    }))
+    assert analytics.totals_by_type() == {6: 120.0, 1: -30.0, 2: 10.0}
+    assert analytics.totals_by_period("month") == {"2024-01": 70.0, "2024-02": 30.0}
+    assert analytics.totals_by_period("week", oper_type=6) == {"2024-W05": 100.0, "2024-W06": 20.0}
+    assert analytics.totals_by_period_and_type("month") == {"2024-01": {6: 100.0, 1: -30.0},
+                                                             "2024-02": {2: 10.0, 6: 20.0}}
+    assert analytics.running_balance() == [("2024-01-30", 20.0), ("2024-02-05", 50.0)]
+    assert analytics.shortage_vs_bonus() == {"shortage": -30.0, "defect": 0.0, "bonus": 10.0, "debonus": 0.0}
+    assert analytics.top_comments(1) == [("sales", 2, 120.0)]
+
+
+def test_append_replaces_last_day_and_skips_older_days():
+    analytics = OperationsAnalytics(make_response(0, {
+        "2024-01-01": [(6, 10, "a")],
+        "2024-01-02": [(6, 5, "a")],
+    }))
+    analytics.append(make_response(0, {
+        "2024-01-01": [(6, 999, "changed")],
+        "2024-01-02": [(6, 7, "b")],
+        "2024-01-03": [(1, -1, "c")],
+    }))
+    assert analytics.totals_by_period() == {"2024-01-01": 10.0, "2024-01-02": 7.0, "2024-01-03": -1.0}
+    assert sorted(analytics.top_comments()) == [("a", 1, 10.0), ("b", 1, 7.0), ("c", 1, -1.0)]
+
+
+def test_replaced_day_keeps_totals_consistent():
+    analytics = OperationsAnalytics(make_response(0, {"2024-01-01": [(1, 0.1, None), (2, 1, None)]}))
+    for _ in range(5):
+        analytics.append(make_response(0, {"2024-01-01": [(1, 0.1, None)]}))
+    assert analytics.totals_by_type() == {1: 0.1}
+    assert analytics.totals_by_period("month", 1) == {"2024-01": 0.1}
+
+
+def test_unknown_period_without_days():
+    analytics = OperationsAnalytics()
+    for rollup in (analytics.totals_by_period, analytics.totals_by_period_and_type, analytics.running_balance):
+        with pytest.raises(ValueError):
+            rollup("year")
@@ -0,0 +1,115 @@
+import asyncio
+import copy
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from functools import partial
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pydantic import ValidationError
+
+from wb_franchise_api_client import (ApiAuth, ApiClient, HTTPException, OfficeRate, OperationsResponse,
+                                     create_parse_executor, parse_model_list, transform_operations)
+from wb_franchise_api_client import api_client as api_client_module
+
+OPERATIONS = {"balance": 100, "currency_code": "RUB", "plan_payment_date": "2024-02-01", "details": [
+    {"date": "2024-01-01", "operations": [
+        {"dt": "2024-01-01", "oper_type": 6, "oper_amount": 100, "grouped": [
+            {"dt": "2024-01-01", "oper_type": 6, "oper_amount": 60, "comment": "a",
+             "grouped": [{"dt": "2024-01-01", "oper_type": 6, "oper_amount": 60}]},
+        ]},
+    ]},
+]}
+
+RESPONSES = {
+    "/api/v1/franchise/office/rates": (b'[{"avg_rate": 4.5, "avg_region_rate": 4.7, "office_id": 1}]', "application/json"),
+    "/api/v1/franchise/office/on-place": (b'[{"avg_hours": "slow", "avg_hours_by_region": 1, "office_id": 1}]',
+                                          "application/json"),
+    "/api/v1/franchise/office/info/workload": (b"not json", "text/plain"),
+    "/api/v2/franchise/shortages/offices": (b"<html></html>", "text/html"),
+    "/api/v1/franchise/office/rates/cp1251": ('[{"avg_rate": 4.5, "avg_region_rate": 4.7, "office_id": 1, "x": "офис"}]'
+                                             .encode("cp1251"), "application/json; charset=windows-1251"),
+    "/api/v1/franchise/office/rates/broken": ("[{\"x\": \"офис\"}]".encode("cp1251"), "application/json"),
+    "/api/v1/franchise/payslip": (json.dumps(OPERATIONS).encode(), "application/json"),
+}
+
+
+async def handler(request: web.Request) -> web.Response:
+    body, content_type = RESPONSES[request.path]
+    return web.Response(body=body, headers={"Content-Type": content_type})
+
+
+async def run_client(executor, call):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    async with TestServer(app) as server:
+        client = ApiClient(ApiAuth("", str(server.make_url("")).rstrip("/")), None, "79000000000",
+                           parse_executor=executor)
+        return await call(client)
+
+
+@pytest.fixture(params=["inline", "thread", "process"])
+def executor(request):
+    if request.param == "inline":
+        yield None
+        return
+    pool = create_parse_executor(1, processes=request.param == "process")
+    with pool:
+        yield pool
+
+
+def test_parsed_models(executor):
+    rates = asyncio.run(run_client(executor, lambda client: client.get_office_rates([1])))
+    assert rates == [OfficeRate(avg_rate=4.5, avg_region_rate=4.7, office_id=1)]
+
+
+def test_validation_error(executor):
+    with pytest.raises(ValidationError):
+        asyncio.run(run_client(executor, lambda client: client.get_office_speed([1])))
+
+
+def test_json_decode_error(executor):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run_client(executor, lambda client: client.get_office_workload([1])))
+    assert "JSONDecodeError" in error.value.message
+
+
+def test_content_type_error(executor):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run_client(executor, lambda client: client.get_shortages_data()))
+    assert "ContentTypeError" in error.value.message
+
+
+def test_operations(executor):
+    operations = asyncio.run(run_client(executor, lambda client: client.get_operations(1)))
+    assert operations == OperationsResponse(**transform_operations(copy.deepcopy(OPERATIONS)))
+    assert operations.details[0].operations[0].grouped[0].grouped[0].oper_amount == 60
+
+
+def test_response_charset(executor):
+    async def call(client):
+        return await client._get_parsed_data_wb(parser=partial(parse_model_list, OfficeRate), method="GET",
+                                                path="/api/v1/franchise/office/rates/cp1251", prefix="office_rates")
+
+    assert asyncio.run(run_client(executor, call)) == [OfficeRate(avg_rate=4.5, avg_region_rate=4.7, office_id=1)]
+
+
+def test_undecodable_body(executor):
+    async def call(client):
+        return await client._get_parsed_data_wb(parser=partial(parse_model_list, OfficeRate), method="GET",
+                                                path="/api/v1/franchise/office/rates/broken", prefix="office_rates")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run_client(executor, call))
+    assert "JSONDecodeError" in error.value.message
+
+
+def test_create_parse_executor_start_method(monkeypatch):
+    with create_parse_executor(1) as executor:
+        assert isinstance(executor, ThreadPoolExecutor)
+    monkeypatch.setattr(api_client_module.multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with create_parse_executor(1, processes=True) as executor:
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert executor._mp_context.get_start_method() == "spawn"
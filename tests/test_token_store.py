@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import aioredis as fakeredis
+
+from wb_franchise_api_client import (ApiAuth, ApiClient, MemoryTokenStore, RedisTokenStore, StoredTokens,
+                                     TokenResponse)
+from wb_franchise_api_client import token_store as token_store_module
+
+
+def token(access_token: str = "access", expires_in: int = 3600, refresh_token: str = "refresh") -> TokenResponse:
+    return TokenResponse(access_token=access_token, expires_in=expires_in, refresh_token=refresh_token,
+                         token_type="Bearer")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemoryTokenStore(refresh_token_ttl=7200)
+    return RedisTokenStore(fakeredis.FakeRedis(), refresh_token_ttl=7200)
+
+
+def test_get_many_and_missing_phones(store):
+    async def scenario():
+        await store.set_many({"1": token("a1"), "2": token("a2", refresh_token="r2")})
+        return await store.get_many(["1", "2", "3"])
+
+    now = time.time()
+    tokens = asyncio.run(scenario())
+    assert tokens["1"].access_token == "a1"
+    assert tokens["2"].refresh_token == "r2"
+    assert now + 3600 <= tokens["1"].expires_at <= time.time() + 3600
+    assert tokens["3"] == StoredTokens()
+    assert asyncio.run(store.get_many([])) == {}
+
+
+def test_set_access_token_keeps_refresh_token(store):
+    async def scenario():
+        await store.set("1", token())
+        await store.set_access_token("1", "new")
+        return await store.get("1")
+
+    tokens = asyncio.run(scenario())
+    assert tokens == StoredTokens(access_token="new", refresh_token="refresh", expires_at=None)
+
+
+def test_non_positive_expires_in_means_no_expiry(store):
+    async def scenario():
+        await store.set_many({"1": token("a1", expires_in=0), "2": token("a2")})
+        return await store.get_many(["1", "2"])
+
+    tokens = asyncio.run(scenario())
+    assert tokens["1"] == StoredTokens(access_token="a1", refresh_token="refresh", expires_at=None)
+    assert tokens["2"].access_token == "a2"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_store_ttl():
+    clock = FakeClock()
+    store = MemoryTokenStore(refresh_token_ttl=7200, clock=clock)
+    asyncio.run(store.set("1", token()))
+    clock.now += 3601
+    assert asyncio.run(store.get("1")) == StoredTokens(refresh_token="refresh")
+    clock.now += 3600
+    assert asyncio.run(store.get("1")) == StoredTokens()
+
+
+def test_memory_store_sweeps_expired_keys_on_write():
+    clock = FakeClock()
+    store = MemoryTokenStore(refresh_token_ttl=7200, clock=clock)
+    asyncio.run(store.set("1", token()))
+    clock.now += 7201
+    asyncio.run(store.set("2", token()))
+    assert sorted(store._data) == ["2:access_token", "2:expires_at", "2:refresh_token"]
+
+
+def test_redis_store_ttl():
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    store = RedisTokenStore(redis_client, refresh_token_ttl=7200)
+
+    async def scenario():
+        await store.set("1", token())
+        return [await redis_client.ttl(key) for key in ("1:access_token", "1:expires_at", "1:refresh_token")]
+
+    access_ttl, expires_ttl, refresh_ttl = asyncio.run(scenario())
+    assert 3590 <= access_ttl <= 3600
+    assert 3590 <= expires_ttl <= 3600
+    assert 7190 <= refresh_ttl <= 7200
+
+
+def test_redis_store_closes_only_owned_client(monkeypatch):
+    redis_client = fakeredis.FakeRedis()
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    monkeypatch.setattr(redis_client, "close", close)
+    asyncio.run(RedisTokenStore(redis_client).close())
+    assert closed == []
+
+    monkeypatch.setattr(token_store_module.aioredis, "from_url", lambda url, **kwargs: redis_client)
+    asyncio.run(RedisTokenStore.from_url("redis://localhost").close())
+    assert closed == [True]
+
+
+def test_is_expired_leeway():
+    assert StoredTokens().is_expired()
+    assert StoredTokens(access_token="a").is_expired() is False
+    assert StoredTokens(access_token="a", expires_at=time.time() + 10).is_expired()
+    assert StoredTokens(access_token="a", expires_at=time.time() + 10).is_expired(leeway=0) is False
+
+
+def test_client_loads_access_token():
+    store = MemoryTokenStore()
+    client = ApiClient(ApiAuth("", ""), None, "1", token_store=store)
+    assert asyncio.run(client.load_access_token()) is False
+    asyncio.run(store.set("1", token("a1")))
+    assert asyncio.run(client.load_access_token()) is True
+    assert client.headers["Authorization"] == "Bearer a1"
@@ -2,5 +2,6 @@ from .api_config import *
 from .models import *
 from .services import *
 from .api_auth import *
+from .token_store import *
 from .api_client import *
 
@@ -1,24 +1,144 @@
 import aiohttp
-from typing import Optional, Dict, Any
+import asyncio
+import codecs
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Optional, Dict, Any, Callable
 from .models import *
 import json
 import redis.asyncio as aioredis
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from .api_config import HTTPException
 from .api_auth import ApiAuth
+from .token_store import TokenStore, RedisTokenStore
+
+
+ERROR_STATUS = {
+    "account": "Ошибка получения данных аккаунта",
+    "sales": "Ошибка получения данных по продажам",
+    "reward": "Ошибка получения данных по вознаграждениям",
+    "shortages": "Ошибка получения данных по недостачам",
+    "history_shortage": "Ошибка получения данных по истории недостачи",
+    "shks": "Ошибка получения данных по ШК в недостаче",
+    "office_rates": "Ошибка получения данных по рейтингам офисов",
+    "office_speed": "Ошибка получения данных по скорости офисов",
+    "office_workload": "Ошибка получения данных по загрузке офисов",
+    "operations": f"Ошибка получения данных по операциям",
+    "employees": f"Ошибка получения данных по сотрудникам",
+    "employees_operations": f"Ошибка получения данных по операциям сотрудников",
+}
+
+
+# Парсеры ответов - функции уровня модуля, чтобы их можно было передать в пул процессов.
+# Принимают тело ответа (bytes или str), JSON разбирается и валидируется pydantic-core
+# без промежуточных python dict там, где это возможно.
+@lru_cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def parse_model(model: type[BaseModel], body: bytes | str) -> BaseModel:
+    return model.model_validate_json(body)
+
+
+def parse_model_list(model: type[BaseModel], body: bytes | str) -> list[BaseModel]:
+    return _list_adapter(model).validate_json(body)
+
+
+def parse_account_data(body: bytes | str) -> AccountData:
+    data = json.loads(body)
+    for employee in data['employees']:
+        employee['phones'] = [str(phone) for phone in employee['phones']]
+    return AccountData(**data)
+
+
+def parse_operations(body: bytes | str) -> OperationsResponse:
+    # grouped валидируется как list[Operation], transform_operations не нужен
+    return OperationsResponse.model_validate_json(body)
+
+
+def parse_raw_response(parser: Callable[[bytes | str], Any],
+                       body: bytes,
+                       status: int,
+                       prefix: str,
+                       charset: Optional[str] = None) -> Any:
+    """Decode and validate response body - inline or in parse executor
+
+    :param parser: Parser of response body
+    :param body: Raw response body
+    :param status: HTTP status code
+    :param prefix: API prefix to determine where was an error
+    :param charset: Charset of response, UTF-8 if not set
+    :return: Parsed response
+    """
+    error = ERROR_STATUS.get(prefix, 'Ошибка')
+    try:
+        if charset and codecs.lookup(charset).name != "utf-8":
+            body = body.decode(charset)
+    except (LookupError, UnicodeDecodeError):
+        raise HTTPException(status,
+                            f"{error} (UnicodeDecodeError): {body.decode(errors='replace')} (charset: {charset})")
+    try:
+        return parser(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+    except ValidationError as validation_error:
+        if not any(item["type"] == "json_invalid" for item in validation_error.errors()):
+            raise
+    if isinstance(body, bytes):
+        body = body.decode(errors='replace')
+    raise HTTPException(status, f"{error} (JSONDecodeError): {body}")
+
+
+def create_parse_executor(max_workers: Optional[int] = None, processes: bool = False) -> Executor:
+    """Create executor for parsing responses - Пул для разбора ответов
+
+    By default a thread pool: results are returned without pickling. Parsing runs
+    in parallel only on free-threaded Python; with GIL the threads still compete
+    with the event loop.
+
+    processes=True is opt-in: parsed models are pickled in the worker and unpickled
+    in the event loop process, which costs about as much CPU as parsing inline
+    (see benchmarks/parse_executor.py). Processes are started with forkserver
+    (spawn where forkserver is not available): forking a running event loop with
+    aiohttp resolver threads is unsafe.
+
+    :param max_workers: Number of workers, by default number of CPUs
+    :param processes: Use process pool instead of thread pool
+    :return: Executor
+    """
+    if not processes:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
 
 
 class ApiClient:
     """API Client for API Franchise
 
-    :param access_token: access token for requests
-    :param api_config: APIConfig instance
+    :param api_auth: ApiAuth instance
+    :param redis_client: Redis client for tokens, used when token_store is not set
+    :param phone: phone number of account
+    :param parse_executor: Optional executor for JSON decoding and validation of responses,
+        see create_parse_executor. The executor is owned by caller.
+    :param token_store: Optional TokenStore, can be shared between clients
     """
 
-    def __init__(self, api_auth: ApiAuth, redis_client: aioredis.Redis, phone: str):
+    def __init__(self,
+                 api_auth: ApiAuth,
+                 redis_client: Optional[aioredis.Redis],
+                 phone: str,
+                 parse_executor: Optional[Executor] = None,
+                 token_store: Optional[TokenStore] = None):
         self.redis_client = redis_client
         self.api_auth = api_auth
         self.phone = phone
+        self.parse_executor = parse_executor
+        if token_store is None and redis_client is not None:
+            token_store = RedisTokenStore(redis_client)
+        self.token_store = token_store
         self.access_token = None
         self.headers = {}
         self._initialize_headers()
@@ -42,22 +162,44 @@ class ApiClient:
             "Authorization": f"Bearer {access_token}",
         }
 
-    async def update_access_token(self, new_access_token: str) -> None:
-        """Update the access token and save it in Redis."""
-        self.access_token = new_access_token
-        self.headers = self._build_headers(new_access_token)
-        if self.redis_client:
-            await self.redis_client.set(f"{self.phone}:access_token", new_access_token)
+    def _set_access_token(self, access_token: str) -> None:
+        self.access_token = access_token
+        self.headers = self._build_headers(access_token)
+
+    async def load_access_token(self) -> bool:
+        """Load not expired access token from the token store.
+
+        :return: True if token was loaded
+        """
+        if not self.token_store:
+            return False
+        tokens = await self.token_store.get(self.phone)
+        if tokens.is_expired():
+            return False
+        self._set_access_token(tokens.access_token)
+        return True
+
+    async def update_access_token(self, new_access_token: str, expires_in: Optional[int] = None) -> None:
+        """Update the access token and save it in the token store."""
+        self._set_access_token(new_access_token)
+        if self.token_store:
+            await self.token_store.set_access_token(self.phone, new_access_token, expires_in)
+
+    async def update_tokens(self, tokens: TokenResponse) -> None:
+        """Update the access token and save access token, refresh token and expiry in the token store."""
+        self._set_access_token(tokens.access_token)
+        if self.token_store:
+            await self.token_store.set(self.phone, tokens)
 
     async def _request_token(self) -> None:
         """Refresh the token if needed and update it."""
-        if self.redis_client:
-            refresh_token = await self.redis_client.get(f"{self.phone}:refresh_token")
+        if self.token_store:
+            refresh_token = (await self.token_store.get(self.phone)).refresh_token
             if not refresh_token:
-                raise HTTPException("Refresh token not found")
+                raise HTTPException(401, "Refresh token not found")
 
             new_tokens = await self.api_auth.connect_code(username=self.phone, refresh_token=refresh_token)
-            await self.update_access_token(new_tokens.access_token)
+            await self.update_tokens(new_tokens)
 
     async def _request_with_retry(self,
                                   *,
@@ -67,22 +209,12 @@ class ApiClient:
                                   params: Optional[Dict[str, Any]] = None,
                                   data: Optional[Dict[str, Any]] = None,
                                   prefix: str,
+                                  raw: bool = False,
                                   attempt=1):
-        """Make a request with a possible token refresh and retry on 401"""
-        ERROR_STATUS = {
-            "account": "Ошибка получения данных аккаунта",
-            "sales": "Ошибка получения данных по продажам",
-            "reward": "Ошибка получения данных по вознаграждениям",
-            "shortages": "Ошибка получения данных по недостачам",
-            "history_shortage": "Ошибка получения данных по истории недостачи",
-            "shks": "Ошибка получения данных по ШК в недостаче",
-            "office_rates": "Ошибка получения данных по рейтингам офисов",
-            "office_speed": "Ошибка получения данных по скорости офисов",
-            "office_workload": "Ошибка получения данных по загрузке офисов",
-            "operations": f"Ошибка получения данных по операциям",
-            "employees": f"Ошибка получения данных по сотрудникам",
-            "employees_operations": f"Ошибка получения данных по операциям сотрудников",
-        }
+        """Make a request with a possible token refresh and retry on 401
+
+        With raw=True returns (status, body, charset) without decoding JSON.
+        """
         async with session.request(method, url, params=params, json=data, headers=self.headers) as response:
             if response.status == 401 and attempt == 1:
                 await self._request_token()
@@ -93,10 +225,20 @@ class ApiClient:
                     params=params,
                     data=data,
                     prefix=prefix,
+                    raw=raw,
                     attempt=2)
             elif response.status in {400, 403, 429, 500}:
                 raise HTTPException(response.status, f"{ERROR_STATUS.get(prefix, 'Ошибка')}: { await response.text()}")
 
+            if raw:
+                content_type = response.headers.get("Content-Type", '')
+                if "json" not in content_type and not content_type.startswith("text/plain"):
+                    response_text = await response.text()
+                    raise HTTPException(response.status,
+                                        f"{ERROR_STATUS.get(prefix, 'Ошибка')} (ContentTypeError): "
+                                        f"{response_text} (Content-Type: {content_type})")
+                return response.status, await response.read(), response.charset
+
             try:
                 return await response.json()
             except aiohttp.ContentTypeError:
@@ -145,17 +287,52 @@ class ApiClient:
                 return response_data.get("status", response_data)
             return response_data
 
+    async def _get_parsed_data_wb(self,
+                                  *,
+                                  parser: Callable[[Any], Any],
+                                  method: str,
+                                  path: str,
+                                  params: Optional[Dict[str, Any]] = None,
+                                  data: Optional[Dict[str, Any]] = None,
+                                  prefix: str) -> Any:
+        """Get response from API and parse it - Получение и разбор ответа
+
+        Raw body is decoded and validated by parse_raw_response: inline without
+        parse_executor, in the executor otherwise (event loop only does I/O).
+
+        :param parser: Module level function converting response body to models
+        :param method: HTTP method
+        :param path: API path
+        :param params: API params
+        :param data: API data
+        :param prefix: API prefix to determine where was an error
+        :return Parsed response
+        """
+        url = self.api_auth.base_path + path
+        async with aiohttp.ClientSession() as session:
+            status, body, charset = await self._request_with_retry(
+                session=session,
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                prefix=prefix,
+                raw=True)
+        if self.parse_executor is None:
+            return parse_raw_response(parser, body, status, prefix, charset)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor,
+                                          parse_raw_response, parser, body, status, prefix, charset)
+
     async def get_account_data(self) -> AccountData:
         """Get account data in Franchise - Общие данные аккаунта"""
         path = "/api/v1/franchise/account"
         params = {"in_short": "false"}
-        response_data = await self._get_response_data_wb(method="GET",
-                                                         path=path,
-                                                         params=params,
-                                                         prefix="account")
-        for employee in response_data['employees']:
-            employee['phones'] = [str(phone) for phone in employee['phones']]
-        return AccountData(**response_data)
+        return await self._get_parsed_data_wb(parser=parse_account_data,
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="account")
 
     async def get_sales_data(self, office_ids: list[int], date_from: str, date_to: str) -> list[OfficeProceed]:
         """Get sales data - Товарооборот
@@ -172,8 +349,11 @@ class ApiClient:
             "from": date_from,
             "to": date_to,
         }
-        response_data = await self._get_response_data_wb(method="GET", path=path, params=params, prefix="sales")
-        return [OfficeProceed(**item) for item in response_data]
+        return await self._get_parsed_data_wb(parser=partial(parse_model_list, OfficeProceed),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="sales")
 
     async def get_reward_data(self, office_ids: list[int], date_from: str, date_to: str) -> list[RewardResponse]:
         """Get reward data - Вознаграждения
@@ -190,8 +370,11 @@ class ApiClient:
             "from": date_from,
             "to": date_to,
         }
-        response_data = await self._get_response_data_wb(method="GET", path=path, params=params, prefix="reward")
-        return [RewardResponse(**item) for item in response_data]
+        return await self._get_parsed_data_wb(parser=partial(parse_model_list, RewardResponse),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="reward")
 
     async def get_shortages_data(self) -> ShortageResponse:
         """Get all shortages data - Недостачи
@@ -200,8 +383,10 @@ class ApiClient:
         """
 
         path = "/api/v2/franchise/shortages/offices"
-        response_data = await self._get_response_data_wb(method="GET", path=path, prefix="shortages")
-        return ShortageResponse(**response_data)
+        return await self._get_parsed_data_wb(parser=partial(parse_model, ShortageResponse),
+                                              method="GET",
+                                              path=path,
+                                              prefix="shortages")
 
     async def get_shortage_details(self, shortage_id: int) -> ShksShortage:
         """Get details of shortage - Детализация недостачи по shortage_id
@@ -211,8 +396,11 @@ class ApiClient:
         """
         path = "/api/v2/franchise/shortages"
         params = {"shortage_id": shortage_id}
-        response_data = await self._get_response_data_wb(method="GET", path=path, params=params, prefix="shks")
-        return ShksShortage(**response_data)
+        return await self._get_parsed_data_wb(parser=partial(parse_model, ShksShortage),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="shks")
 
     async def get_history_shortage(self, shortage_id: int) -> HistoryShortage:
         """Get history shortage - История недостачи
@@ -222,11 +410,11 @@ class ApiClient:
         """
         path = "/api/v1/franchise/shortages/history"
         params = {"shortage_id": shortage_id}
-        response_data = await self._get_response_data_wb(method="GET",
-                                                         path=path,
-                                                         params=params,
-                                                         prefix="history_shortage")
-        return HistoryShortage(**response_data)
+        return await self._get_parsed_data_wb(parser=partial(parse_model, HistoryShortage),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="history_shortage")
 
     async def get_office_rates(self, office_ids: list[int]) -> list[OfficeRate]:
         """Get office rates - Получение рейтинга офиса
@@ -237,11 +425,11 @@ class ApiClient:
         path = "/api/v1/franchise/office/rates"
         office_ids_str = ",".join(map(str, office_ids))
         params = {"office_ids": office_ids_str}
-        response_data = await self._get_response_data_wb(method="GET",
-                                                         path=path,
-                                                         params=params,
-                                                         prefix="office_rates")
-        return [OfficeRate(**item) for item in response_data]
+        return await self._get_parsed_data_wb(parser=partial(parse_model_list, OfficeRate),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="office_rates")
 
     async def get_office_speed(self, office_ids: list[int]) -> list[OfficeSpeed]:
         """Get office speed - Время раскладки офисов
@@ -252,8 +440,11 @@ class ApiClient:
         path = "/api/v1/franchise/office/on-place"
         office_ids_str = ",".join(map(str, office_ids))
         params = {"office_ids": office_ids_str}
-        response_data = await self._get_response_data_wb(method="GET", path=path, params=params, prefix="office_speed")
-        return [OfficeSpeed(**item) for item in response_data]
+        return await self._get_parsed_data_wb(parser=partial(parse_model_list, OfficeSpeed),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="office_speed")
 
     async def get_office_workload(self, office_ids: list[int]) -> list[OfficeWorkload]:
         """Get office workload - Загрузка офисов
@@ -264,11 +455,11 @@ class ApiClient:
         path = "/api/v1/franchise/office/info/workload"
         office_ids_str = ",".join(map(str, office_ids))
         params = {"office_ids": office_ids_str}
-        response_data = await self._get_response_data_wb(method="GET",
-                                                         path=path,
-                                                         params=params,
-                                                         prefix="office_workload")
-        return [OfficeWorkload(**item) for item in response_data]
+        return await self._get_parsed_data_wb(parser=partial(parse_model_list, OfficeWorkload),
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="office_workload")
 
     async def get_operations(self, supplier_id: int) -> OperationsResponse:
         """Get all operations - Все операции - Детализация
@@ -281,11 +472,11 @@ class ApiClient:
             "supplier_id": supplier_id,
             "all": "true"
         }
-        response_data = await self._get_response_data_wb(method="GET", path=path, params=params, prefix="operations")
-        # Преобразуем данные перед валидацией
-        transformed_data = transform_operations(response_data)
-
-        return OperationsResponse(**transformed_data)
+        return await self._get_parsed_data_wb(parser=parse_operations,
+                                              method="GET",
+                                              path=path,
+                                              params=params,
+                                              prefix="operations")
 
 
 # async def main():
@@ -21,7 +21,7 @@ class HTTPException(Exception):
     def __init__(self, status_code: int, message: str):
         self.status_code = status_code
         self.message = message
-        super().__init__(f"{status_code} {message}")
+        super().__init__(status_code, message)
 
     def __str__(self):
         return f"{self.status_code} {self.message}"
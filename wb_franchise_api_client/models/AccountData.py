@@ -1,7 +1,10 @@
+from functools import cached_property
 from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from .IndexedModel import IndexedModel
+
 
 class Employee(BaseModel):
     """Model for Employee"""
@@ -24,9 +27,22 @@ class Office(BaseModel):
     office_shk: str
 
 
-class AccountData(BaseModel):
+class AccountData(IndexedModel):
+    """Model for account data
+
+    Indexes are snapshots built on first access, see IndexedModel.
+    """
     supplier_id: int
     name: str
     employees: list[Employee]
     offices: list[Office]
 
+    @cached_property
+    def employees_by_id(self) -> dict[int, Employee]:
+        """Employees indexed by employee_id - Сотрудники по employee_id"""
+        return {employee.employee_id: employee for employee in self.employees}
+
+    @cached_property
+    def offices_by_id(self) -> dict[int, Office]:
+        """Offices indexed by id - Офисы по id"""
+        return {office.id: office for office in self.offices}
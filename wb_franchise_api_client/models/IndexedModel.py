@@ -0,0 +1,43 @@
+from functools import cached_property
+from typing import Any, ClassVar, Optional
+
+from pydantic import BaseModel
+
+
+class IndexedModel(BaseModel):
+    """Base model for responses with lazily built indexes (cached_property)
+
+    An index is a snapshot built on first access. It is dropped when a field of
+    this model is assigned and in copies (model_copy, copy.copy, copy.deepcopy).
+    It is not dropped when a list is mutated in place or when a field of a nested
+    model is assigned (e.g. response.offices[0].shortages = []) - call
+    drop_indexes() on the parent after that.
+    """
+    __index_names__: ClassVar[frozenset[str]] = frozenset()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__index_names__ = frozenset(name
+                                        for klass in cls.__mro__
+                                        for name, attr in vars(klass).items()
+                                        if isinstance(attr, cached_property))
+
+    def drop_indexes(self) -> None:
+        """Drop built indexes, they are rebuilt on next access"""
+        for name in self.__index_names__:
+            self.__dict__.pop(name, None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.drop_indexes()
+
+    def __copy__(self):
+        copied = super().__copy__()
+        copied.drop_indexes()
+        return copied
+
+    def __deepcopy__(self, memo: Optional[dict[int, Any]] = None):
+        copied = super().__deepcopy__(memo)
+        copied.drop_indexes()
+        return copied
@@ -1,7 +1,10 @@
+from functools import cached_property
 from typing import Optional, List, Any
 
 from pydantic import BaseModel, Field
 
+from .IndexedModel import IndexedModel
+
 
 class Operation(BaseModel):
     """Model for Operation
@@ -28,12 +31,21 @@ class OperationsByDate(BaseModel):
     operations: list[Operation]
 
 
-class OperationsResponse(BaseModel):
+class OperationsResponse(IndexedModel):
+    """Model for operations
+
+    Indexes are snapshots built on first access, see IndexedModel.
+    """
     balance: float
     currency_code: str
     plan_payment_date: str
     details: list[OperationsByDate]
 
+    @cached_property
+    def details_by_date(self) -> dict[str, OperationsByDate]:
+        """Operations indexed by date - Операции по датам"""
+        return {detail.date: detail for detail in self.details}
+
 
 Operation.update_forward_refs()
 
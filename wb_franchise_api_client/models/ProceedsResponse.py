@@ -1,5 +1,9 @@
+from functools import cached_property
+
 from pydantic import BaseModel
 
+from .IndexedModel import IndexedModel
+
 
 class ByOffice(BaseModel):
     date: str
@@ -13,12 +17,23 @@ class ByOffice(BaseModel):
     source_type: int
 
 
-class OfficeProceed(BaseModel):
+class OfficeProceed(IndexedModel):
+    """Model for office proceeds
+
+    Indexes are snapshots built on first access, see IndexedModel.
+    """
     office_id: int
     office_name: str
     office_shk: str
     by_office: list[ByOffice]
 
+    @cached_property
+    def by_date(self) -> dict[str, list[ByOffice]]:
+        """Office proceeds grouped by date - Товарооборот по датам
 
-
-
+        A date can have several rows (different source_type).
+        """
+        result: dict[str, list[ByOffice]] = {}
+        for item in self.by_office:
+            result.setdefault(item.date, []).append(item)
+        return result
@@ -1,7 +1,10 @@
+from functools import cached_property
 from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from .IndexedModel import IndexedModel
+
 
 class Shortage(BaseModel):
     shortage_id: int
@@ -14,15 +17,82 @@ class Shortage(BaseModel):
     is_history_exist: bool
 
 
-class OfficeShortage(BaseModel):
+class OfficeShortage(IndexedModel):
+    """Model for shortages of office
+
+    Indexes are snapshots built on first access, see IndexedModel.
+    """
     office_id: Optional[int] = Field(default=0, alias='office_id')
     office_name: Optional[str] = Field(default="Unknown", alias='office_name')
     office_amount: float
     shortages: list[Shortage]
 
+    @cached_property
+    def shortages_by_id(self) -> dict[int, Shortage]:
+        """Shortages of the office indexed by shortage_id"""
+        return {shortage.shortage_id: shortage for shortage in self.shortages}
+
 
-class ShortageResponse(BaseModel):
+class ShortageResponse(IndexedModel):
+    """Model for shortages of all offices
+
+    Indexes are snapshots built on first access, see IndexedModel.
+    """
     total_amount: float
     offices: list[OfficeShortage]
 
+    @cached_property
+    def offices_by_id(self) -> dict[int, OfficeShortage]:
+        """Offices indexed by office_id - Офисы по office_id
+
+        Offices without office_id (None or default 0) are skipped.
+        """
+        return {office.office_id: office for office in self.offices if office.office_id}
+
+    @cached_property
+    def shortages_by_id(self) -> dict[int, Shortage]:
+        """All shortages indexed by shortage_id - Недостачи по shortage_id"""
+        return {shortage.shortage_id: shortage
+                for office in self.offices
+                for shortage in office.shortages}
+
+    @cached_property
+    def office_id_by_shortage_id(self) -> dict[int, Optional[int]]:
+        """Office id of every shortage - Офис недостачи по shortage_id
+
+        None for shortages of offices without office_id.
+        """
+        return {shortage.shortage_id: office.office_id or None
+                for office in self.offices
+                for shortage in office.shortages}
+
+    @cached_property
+    def shortages_by_employee_id(self) -> dict[int, list[Shortage]]:
+        """Shortages grouped by guilty_employee_id - Недостачи по сотрудникам
+
+        Shortages without a guilty employee are skipped.
+        """
+        result: dict[int, list[Shortage]] = {}
+        for office in self.offices:
+            for shortage in office.shortages:
+                if shortage.guilty_employee_id is not None:
+                    result.setdefault(shortage.guilty_employee_id, []).append(shortage)
+        return result
+
+    @cached_property
+    def shortages_by_status_id(self) -> dict[int, list[Shortage]]:
+        """Shortages grouped by status_id - Недостачи по статусам"""
+        result: dict[int, list[Shortage]] = {}
+        for office in self.offices:
+            for shortage in office.shortages:
+                result.setdefault(shortage.status_id, []).append(shortage)
+        return result
 
+    @cached_property
+    def shortages_by_date(self) -> dict[str, list[Shortage]]:
+        """Shortages grouped by create date (YYYY-MM-DD) - Недостачи по датам"""
+        result: dict[str, list[Shortage]] = {}
+        for office in self.offices:
+            for shortage in office.shortages:
+                result.setdefault(shortage.create_dt[:10], []).append(shortage)
+        return result
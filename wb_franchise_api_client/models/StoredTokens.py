@@ -0,0 +1,18 @@
+import time
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class StoredTokens(BaseModel):
+    """Model for tokens saved in token store
+
+    :arg expires_at : unix time when access token expires
+    """
+    access_token: Optional[str] = Field(default=None)
+    refresh_token: Optional[str] = Field(default=None)
+    expires_at: Optional[float] = Field(default=None)
+
+    def is_expired(self, leeway: float = 30.0) -> bool:
+        """Access token is missing or expires within leeway seconds (clock skew, request time)"""
+        return self.access_token is None or (self.expires_at is not None and self.expires_at - leeway <= time.time())
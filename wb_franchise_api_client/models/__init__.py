@@ -1,5 +1,6 @@
 from .AccountData import *
 from .HistoryShortage import *
+from .IndexedModel import *
 from .OfficeRate import *
 from .OfficeSpeed import *
 from .OfficeWorkload import *
@@ -9,8 +10,5 @@ from .RequestCodeResponse import *
 from .RewardResponse import *
 from .ShksShortage import *
 from .ShortageResponse import *
+from .StoredTokens import *
 from .TokenResponse import *
-
-
-
-
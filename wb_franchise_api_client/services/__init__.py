@@ -0,0 +1,2 @@
+from .indexes import *
+from .operations_analytics import *
@@ -0,0 +1,63 @@
+from typing import Any, Iterable, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def index_by_office(items: Iterable[T]) -> dict[int, T]:
+    """Index per-office items by office_id - Индекс по office_id
+
+    Works for any list returned per office (OfficeProceed, OfficeRate,
+    OfficeSpeed, OfficeWorkload, OfficeShortage). For repeated office_id
+    the last item wins. Items without office_id (None or default 0) are skipped,
+    as in ShortageResponse.offices_by_id.
+
+    :param items: Items with office_id attribute
+    :return: Dict office_id -> item
+    """
+    return {item.office_id: item for item in items if item.office_id}
+
+
+def group_by_office(items: Iterable[T]) -> dict[int, list[T]]:
+    """Group items by office_id - Группировка по office_id
+
+    Use it for lists with several items per office, e.g. RewardResponse.
+    Items without office_id (None or default 0) are skipped.
+
+    :param items: Items with office_id attribute
+    :return: Dict office_id -> list of items
+    """
+    result: dict[int, list[T]] = {}
+    for item in items:
+        if item.office_id:
+            result.setdefault(item.office_id, []).append(item)
+    return result
+
+
+def merge_by_office(**sources: Iterable[Any] | Mapping[int, Any]) -> dict[int, dict[str, Optional[Any]]]:
+    """Join per-office lists from different endpoints in linear time - Объединение данных по офисам
+
+    Example::
+
+        merged = merge_by_office(rate=rates, speed=speeds, reward=group_by_office(rewards))
+        merged[office_id]["speed"].avg_hours
+
+    A source is either a list of items with office_id attribute or an already
+    built dict office_id -> value (e.g. from group_by_office). Every office found
+    in any source gets a key for every source name, missing data is None.
+    Items and dict keys without office_id (None or 0) are skipped.
+
+    :param sources: Source name -> items or dict office_id -> value
+    :return: Dict office_id -> {source name: value | None}
+    """
+    merged: dict[int, dict[str, Optional[Any]]] = {}
+    names = list(sources)
+    for name, items in sources.items():
+        pairs = items.items() if isinstance(items, Mapping) else ((item.office_id, item) for item in items)
+        for office_id, value in pairs:
+            if not office_id:
+                continue
+            row = merged.get(office_id)
+            if row is None:
+                row = merged[office_id] = dict.fromkeys(names)
+            row[name] = value
+    return merged
@@ -0,0 +1,197 @@
+import heapq
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional
+
+from ..models import Operation, OperationsByDate, OperationsResponse
+
+OPER_SHORTAGE = 1
+OPER_BONUS = 2
+OPER_DEBONUS = 3
+OPER_DEFECT = 4
+OPER_WITHDRAWAL = 5
+OPER_SALES_REWARD = 6
+
+PERIODS = ("day", "week", "month")
+
+
+def flatten_operations(operations: Iterable[Operation]) -> list[Operation]:
+    """Flatten operations with nested grouped - Развернуть сгруппированные операции
+
+    An operation with grouped is replaced by its grouped operations (recursively),
+    so amounts are not counted twice.
+
+    :param operations: Operations
+    :return: List of leaf operations
+    """
+    result = []
+    stack = list(reversed(list(operations)))
+    while stack:
+        operation = stack.pop()
+        if operation.grouped:
+            stack.extend(reversed(operation.grouped))
+        else:
+            result.append(operation)
+    return result
+
+
+def _check_period(period: str) -> None:
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period}, expected one of {PERIODS}")
+
+
+def _period_key(day: date, period: str) -> str:
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return f"{day.year}-{day.month:02d}"
+    raise ValueError(f"Unknown period: {period}, expected one of {PERIODS}")
+
+
+class OperationsAnalytics:
+    """Analytics over payslip operations - Аналитика по операциям
+
+    Operations are flattened once per date into per-day totals by oper_type and
+    comment counters, rollups are built from these per-day totals. append() only
+    flattens days that are not loaded yet and the last loaded day (the partial
+    day that may still change, its data is replaced); older loaded days are skipped,
+    so appending a full response (get_operations returns all days) is incremental.
+
+    :param response: Optional OperationsResponse to load
+    """
+
+    def __init__(self, response: Optional[OperationsResponse] = None):
+        self.balance: Optional[float] = None
+        self.currency_code: Optional[str] = None
+        self.plan_payment_date: Optional[str] = None
+        self._days: dict[date, dict[int, float]] = {}
+        self._day_comments: dict[date, Counter] = {}
+        self._day_comment_amounts: dict[date, dict[str, float]] = {}
+        self._comment_counts: Counter = Counter()
+        if response is not None:
+            self.append(response)
+
+    @property
+    def days(self) -> list[date]:
+        """Loaded days in ascending order"""
+        return sorted(self._days)
+
+    def append(self, response: OperationsResponse) -> None:
+        """Add operations from a newer response - Добавить операции
+
+        Days before the last loaded day that are already loaded are skipped,
+        the last loaded day is replaced, other days are added.
+
+        :param response: OperationsResponse
+        """
+        self.balance = response.balance
+        self.currency_code = response.currency_code
+        self.plan_payment_date = response.plan_payment_date
+        last_day = max(self._days, default=None)
+        for detail in response.details:
+            day = date.fromisoformat(detail.date[:10])
+            if day in self._days and day != last_day:
+                continue
+            self._add_detail(day, detail)
+
+    def _add_detail(self, day: date, detail: OperationsByDate) -> None:
+        if day in self._days:
+            self._remove_day(day)
+        totals: dict[int, float] = {}
+        comments: Counter = Counter()
+        comment_amounts: dict[str, float] = {}
+        for operation in flatten_operations(detail.operations):
+            totals[operation.oper_type] = totals.get(operation.oper_type, 0.0) + operation.oper_amount
+            if operation.comment:
+                comments[operation.comment] += 1
+                comment_amounts[operation.comment] = comment_amounts.get(operation.comment, 0.0) + operation.oper_amount
+        self._days[day] = totals
+        self._day_comments[day] = comments
+        self._day_comment_amounts[day] = comment_amounts
+        self._comment_counts.update(comments)
+
+    def _remove_day(self, day: date) -> None:
+        del self._days[day]
+        del self._day_comment_amounts[day]
+        self._comment_counts.subtract(self._day_comments.pop(day))
+        self._comment_counts = +self._comment_counts
+
+    def totals_by_type(self) -> dict[int, float]:
+        """Total amount by oper_type - Итоги по типам операций"""
+        result: dict[int, float] = {}
+        for day in self.days:
+            for oper_type, amount in self._days[day].items():
+                result[oper_type] = result.get(oper_type, 0.0) + amount
+        return result
+
+    def totals_by_period(self, period: str = "day", oper_type: Optional[int] = None) -> dict[str, float]:
+        """Total amount by day, week or month - Итоги по периодам
+
+        :param period: day, week (YYYY-Www, ISO week) or month (YYYY-MM)
+        :param oper_type: Only this operation type, all types if None
+        :return: Dict period key -> amount, ordered by period
+        """
+        _check_period(period)
+        result: dict[str, float] = {}
+        for day in self.days:
+            totals = self._days[day]
+            amount = sum(totals.values()) if oper_type is None else totals.get(oper_type, 0.0)
+            key = _period_key(day, period)
+            result[key] = result.get(key, 0.0) + amount
+        return result
+
+    def totals_by_period_and_type(self, period: str = "day") -> dict[str, dict[int, float]]:
+        """Total amount by period and oper_type - Итоги по периодам и типам операций
+
+        :param period: day, week or month
+        :return: Dict period key -> {oper_type: amount}, ordered by period
+        """
+        _check_period(period)
+        result: dict[str, dict[int, float]] = {}
+        for day in self.days:
+            row = result.setdefault(_period_key(day, period), {})
+            for oper_type, amount in self._days[day].items():
+                row[oper_type] = row.get(oper_type, 0.0) + amount
+        return result
+
+    def running_balance(self, period: str = "day") -> list[tuple[str, float]]:
+        """Balance at the end of every period - Баланс на конец периода
+
+        Anchored to the balance of the last appended response: the last value
+        equals response.balance, earlier values subtract the later periods.
+
+        :param period: day, week or month
+        :return: List of (period key, balance)
+        """
+        _check_period(period)
+        result = []
+        balance = self.balance or 0.0
+        for key, amount in reversed(self.totals_by_period(period).items()):
+            result.append((key, balance))
+            balance -= amount
+        result.reverse()
+        return result
+
+    def shortage_vs_bonus(self) -> dict[str, float]:
+        """Shortages against bonuses - Недостачи против премирования"""
+        totals = self.totals_by_type()
+        return {
+            "shortage": totals.get(OPER_SHORTAGE, 0.0),
+            "defect": totals.get(OPER_DEFECT, 0.0),
+            "bonus": totals.get(OPER_BONUS, 0.0),
+            "debonus": totals.get(OPER_DEBONUS, 0.0),
+        }
+
+    def top_comments(self, n: int = 10) -> list[tuple[str, int, float]]:
+        """Most frequent operation comments - Самые частые комментарии
+
+        :param n: Number of comments
+        :return: List of (comment, count, total amount)
+        """
+        top = heapq.nlargest(n, self._comment_counts.items(), key=lambda item: item[1])
+        days = self.days
+        return [(comment, count, sum(self._day_comment_amounts[day].get(comment, 0.0) for day in days))
+                for comment, count in top]
@@ -0,0 +1,214 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional
+
+import redis.asyncio as aioredis
+
+from .models import StoredTokens, TokenResponse
+
+
+def _ttl(seconds: Optional[int]) -> Optional[int]:
+    """TTL for store: None (no expiry) for missing or non positive lifetime"""
+    if seconds is None or seconds <= 0:
+        return None
+    return seconds
+
+
+class TokenStore(ABC):
+    """Storage of access and refresh tokens by phone - Хранилище токенов"""
+
+    @abstractmethod
+    async def get_many(self, phones: Iterable[str]) -> dict[str, StoredTokens]:
+        """Get tokens for several phones in one round trip
+
+        :param phones: phone numbers
+        :return: Dict phone -> StoredTokens, empty StoredTokens if nothing saved
+        """
+
+    @abstractmethod
+    async def set_many(self, tokens: dict[str, TokenResponse]) -> None:
+        """Save tokens for several phones atomically in one round trip
+
+        :param tokens: Dict phone -> TokenResponse
+        """
+
+    @abstractmethod
+    async def set_access_token(self, phone: str, access_token: str, expires_in: Optional[int] = None) -> None:
+        """Save only access token, refresh token is kept
+
+        :param phone: phone number
+        :param access_token: access token
+        :param expires_in: access token lifetime in seconds
+        """
+
+    async def get(self, phone: str) -> StoredTokens:
+        """Get tokens for phone
+
+        :param phone: phone number
+        :return: StoredTokens
+        """
+        return (await self.get_many([phone]))[phone]
+
+    async def set(self, phone: str, tokens: TokenResponse) -> None:
+        """Save access token, refresh token and expiry for phone
+
+        :param phone: phone number
+        :param tokens: TokenResponse
+        """
+        await self.set_many({phone: tokens})
+
+    async def close(self) -> None:
+        """Release resources of the store"""
+
+
+class RedisTokenStore(TokenStore):
+    """Token store in Redis
+
+    Keys: {phone}:access_token, {phone}:refresh_token, {phone}:expires_at.
+    Access token and expiry are saved with TTL = expires_in, refresh token
+    with refresh_token_ttl (no expiry by default). Non positive lifetime means no expiry.
+
+    :param redis_client: Redis client, use from_url to create one with connection pool.
+        A client passed here is owned by caller and is not closed by close().
+    :param refresh_token_ttl: refresh token lifetime in seconds
+    """
+
+    def __init__(self, redis_client: aioredis.Redis, refresh_token_ttl: Optional[int] = None):
+        self.redis_client = redis_client
+        self.refresh_token_ttl = refresh_token_ttl
+        self._owns_client = False
+
+    @classmethod
+    def from_url(cls,
+                 url: str,
+                 max_connections: Optional[int] = None,
+                 refresh_token_ttl: Optional[int] = None) -> "RedisTokenStore":
+        """Create store with pooled Redis connection, closed with close()
+
+        :param url: Redis url, e.g. redis://localhost:6379/0
+        :param max_connections: max connections in pool
+        :param refresh_token_ttl: refresh token lifetime in seconds
+        """
+        redis_client = aioredis.from_url(url, max_connections=max_connections, decode_responses=True)
+        store = cls(redis_client, refresh_token_ttl=refresh_token_ttl)
+        store._owns_client = True
+        return store
+
+    @staticmethod
+    def _keys(phone: str) -> tuple[str, str, str]:
+        return f"{phone}:access_token", f"{phone}:refresh_token", f"{phone}:expires_at"
+
+    @staticmethod
+    def _decode(value: Optional[bytes | str]) -> Optional[str]:
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def get_many(self, phones: Iterable[str]) -> dict[str, StoredTokens]:
+        phones = list(phones)
+        if not phones:
+            return {}
+        keys = [key for phone in phones for key in self._keys(phone)]
+        values = [self._decode(value) for value in await self.redis_client.mget(keys)]
+        result = {}
+        for i, phone in enumerate(phones):
+            access_token, refresh_token, expires_at = values[i * 3:i * 3 + 3]
+            result[phone] = StoredTokens(access_token=access_token,
+                                         refresh_token=refresh_token,
+                                         expires_at=float(expires_at) if expires_at is not None else None)
+        return result
+
+    async def set_many(self, tokens: dict[str, TokenResponse]) -> None:
+        if not tokens:
+            return
+        now = time.time()
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            for phone, token in tokens.items():
+                self._set_access_token(pipe, phone, token.access_token, token.expires_in, now)
+                pipe.set(self._keys(phone)[1], token.refresh_token, ex=_ttl(self.refresh_token_ttl))
+            await pipe.execute()
+
+    async def set_access_token(self, phone: str, access_token: str, expires_in: Optional[int] = None) -> None:
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            self._set_access_token(pipe, phone, access_token, expires_in, time.time())
+            await pipe.execute()
+
+    def _set_access_token(self, pipe, phone: str, access_token: str, expires_in: Optional[int], now: float) -> None:
+        access_key, _, expires_key = self._keys(phone)
+        ttl = _ttl(expires_in)
+        pipe.set(access_key, access_token, ex=ttl)
+        if ttl:
+            pipe.set(expires_key, now + ttl, ex=ttl)
+        else:
+            pipe.delete(expires_key)
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self.redis_client.close()
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store in process memory - for tests and single node deployments
+
+    Expired keys are removed when read and swept on every write (set_many,
+    set_access_token), so keys of phones that are never read again do not pile up.
+
+    :param refresh_token_ttl: refresh token lifetime in seconds
+    :param clock: function returning current unix time, time.time by default
+    """
+
+    def __init__(self, refresh_token_ttl: Optional[int] = None, clock: Callable[[], float] = time.time):
+        self.refresh_token_ttl = refresh_token_ttl
+        self.clock = clock
+        # key -> (value, unix time of expiry or None)
+        self._data: dict[str, tuple[str, Optional[float]]] = {}
+
+    def _get(self, key: str, now: float) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        return value
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._data.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+
+    def _set(self, key: str, value: str, ttl: Optional[int], now: float) -> None:
+        ttl = _ttl(ttl)
+        self._data[key] = (value, now + ttl if ttl else None)
+
+    def _set_access_token(self, phone: str, access_token: str, expires_in: Optional[int], now: float) -> None:
+        ttl = _ttl(expires_in)
+        self._set(f"{phone}:access_token", access_token, ttl, now)
+        if ttl:
+            self._set(f"{phone}:expires_at", str(now + ttl), ttl, now)
+        else:
+            self._data.pop(f"{phone}:expires_at", None)
+
+    async def get_many(self, phones: Iterable[str]) -> dict[str, StoredTokens]:
+        now = self.clock()
+        result = {}
+        for phone in phones:
+            expires_at = self._get(f"{phone}:expires_at", now)
+            result[phone] = StoredTokens(access_token=self._get(f"{phone}:access_token", now),
+                                         refresh_token=self._get(f"{phone}:refresh_token", now),
+                                         expires_at=float(expires_at) if expires_at is not None else None)
+        return result
+
+    async def set_many(self, tokens: dict[str, TokenResponse]) -> None:
+        now = self.clock()
+        self._sweep(now)
+        for phone, token in tokens.items():
+            self._set_access_token(phone, token.access_token, token.expires_in, now)
+            self._set(f"{phone}:refresh_token", token.refresh_token, self.refresh_token_ttl, now)
+
+    async def set_access_token(self, phone: str, access_token: str, expires_in: Optional[int] = None) -> None:
+        now = self.clock()
+        self._sweep(now)
+        self._set_access_token(phone, access_token, expires_in, now)